@@ -5,16 +5,28 @@ import subprocess
 import os
 import json
 import re
+import tempfile
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QComboBox, QPushButton, QMessageBox,
     QProgressBar, QTextEdit, QFrame, QSizePolicy, QSpacerItem
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QUrl, QSize
-from PyQt5.QtGui import QPainter, QColor, QPen, QIcon, QMovie, QPixmap
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QUrl, QSize, QTimer
+from PyQt5.QtGui import QPainter, QColor, QIcon, QMovie, QPixmap, QImage
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist
 
+# Uygulama dosyalarının yolları (bir kez çözümlenir)
+_ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+_ICON = os.path.join(_ASSET_DIR, 'fragmenter.png')
+_IMG_INITIAL = os.path.join(_ASSET_DIR, '1.png')
+_GIF = os.path.join(_ASSET_DIR, '2.gif')
+_MUSIC = os.path.join(_ASSET_DIR, 'Open Those Bright Eyes.mp3')
+_ICON_EXISTS = os.path.exists(_ICON)
+_MUSIC_EXISTS = os.path.exists(_MUSIC)
+
 # Renk kodları sözlüğü
 COLOR_SCHEME = {
     "empty": QColor(Qt.white),            # Boş yerler
@@ -25,8 +37,28 @@ COLOR_SCHEME = {
     "unknown": QColor(192, 192, 192)      # Gri - Bilinmeyen durumlar / Başlangıç durumu
 }
 
+# Disk haritasındaki blok kimlikleri (PALETTE satır sırasıyla aynı)
+BLOCK_UNKNOWN, BLOCK_FRAGMENTED, BLOCK_NON_FRAGMENTED, BLOCK_EMPTY, BLOCK_METADATA, BLOCK_UNMOVABLE = range(6)
+BLOCK_TYPES = ("unknown", "fragmented", "non_fragmented", "empty", "metadata", "unmovable")
+
+# Renk anahtarı için gri çerçeveli renk örneği
+def _swatch(color):
+    pm = QPixmap(20, 15)
+    pm.fill(color)
+    p = QPainter(pm)
+    p.setPen(Qt.gray)
+    p.drawRect(0, 0, 19, 14)
+    p.end()
+    return pm
+
 # Disk Haritası Çizimi için Özel Widget
 class DiskMapWidget(QFrame):
+    # Blok kimliğinden RGBA rengine arama tablosu
+    PALETTE = np.array(
+        [[COLOR_SCHEME[t].red(), COLOR_SCHEME[t].green(), COLOR_SCHEME[t].blue(), 255] for t in BLOCK_TYPES],
+        dtype=np.uint8
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFrameShape(QFrame.StyledPanel)
@@ -35,18 +67,41 @@ class DiskMapWidget(QFrame):
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
         self.block_size = 10 # Her bloğun piksel boyutu
-        self.disk_map_data = [] # Burası gerçek blok verileriyle dolacak (şimdilik simülasyon)
+        self.disk_map_ids = None # (rows, cols) boyutlu blok kimliği dizisi (şimdilik simülasyon)
         self.cols = 0
         self.rows = 0
+        self._cached_pixmap = None # Harita her değiştiğinde bir kez çizilip burada saklanır
+        self._rgba = None # Önbellek pixmap'inin kaynağı olan RGBA tampon
+        self._grid_tile = self._make_grid_tile() # Izgara karosu bir kez çizilir
+        self._rng = np.random.default_rng() # Harita karıştırması için kalıcı üreteç
+
+        # Sürükleyerek boyutlandırmada gelen ara olayları tek bir yeniden oluşturmada birleştir
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(0)
+        self._resize_timer.timeout.connect(self._do_regenerate)
 
         # Birleştirme skoru tabanlı temsili harita için
         self.fragmentation_score = -1 # -1 başlangıç durumunu temsil eder
         self.generate_dummy_map_data() # Başlangıçta haritayı oluştur
+        self._rebuild_pixmap()
         self.update()
 
+    def _make_grid_tile(self):
+        # Üst ve sol kenarı gri, içi saydam bir blok
+        tile = QPixmap(self.block_size, self.block_size)
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.setPen(Qt.gray)
+        painter.drawLine(0, 0, self.block_size - 1, 0)
+        painter.drawLine(0, 0, 0, self.block_size - 1)
+        painter.end()
+        return tile
+
     def set_fragmentation_score(self, score):
         self.fragmentation_score = score
         self.generate_dummy_map_data() # Skor değiştikçe temsili haritayı güncelle
+        self._rebuild_pixmap()
         self.update() # Widget'ı yeniden çiz
 
     def generate_dummy_map_data(self):
@@ -56,7 +111,7 @@ class DiskMapWidget(QFrame):
         if widget_width <= 0 or widget_height <= 0:
             self.cols = 0
             self.rows = 0
-            self.disk_map_data = []
+            self.disk_map_ids = None
             return
 
         self.cols = widget_width // self.block_size
@@ -64,14 +119,12 @@ class DiskMapWidget(QFrame):
         total_blocks = self.cols * self.rows
 
         if total_blocks == 0:
-            self.disk_map_data = []
+            self.disk_map_ids = None
             return
 
-        self.disk_map_data = []
-        
         if self.fragmentation_score == -1:
             # Başlangıç durumu: Tüm bloklar açık gri (unknown)
-            self.disk_map_data = [[COLOR_SCHEME["unknown"]] * self.cols for _ in range(self.rows)]
+            self.disk_map_ids = np.full((self.rows, self.cols), BLOCK_UNKNOWN, dtype=np.uint8)
             return
 
         # Parçalanma oranına göre renk dağılımı
@@ -101,56 +154,71 @@ class DiskMapWidget(QFrame):
         num_metadata = int(total_blocks * metadata_ratio)
         num_unmovable = int(total_blocks * unmovable_ratio)
 
-        block_types = (
-            [COLOR_SCHEME["fragmented"]] * num_fragmented +
-            [COLOR_SCHEME["non_fragmented"]] * num_non_fragmented +
-            [COLOR_SCHEME["empty"]] * num_empty +
-            [COLOR_SCHEME["metadata"]] * num_metadata +
-            [COLOR_SCHEME["unmovable"]] * num_unmovable
-        )
-        
-        remaining_blocks = total_blocks - len(block_types)
-        if remaining_blocks > 0:
-            block_types.extend([COLOR_SCHEME["unknown"]] * remaining_blocks)
-
-        import random
-        random.shuffle(block_types)
-
-        self.disk_map_data = []
-        for i in range(self.rows):
-            row_data = []
-            for j in range(self.cols):
-                if block_types:
-                    row_data.append(block_types.pop(0))
-                else:
-                    row_data.append(COLOR_SCHEME["unknown"])
-            self.disk_map_data.append(row_data)
+        # Blok kimliklerini sırayla dilimlere yaz; artan bloklar "unknown" olarak kalır
+        ids = np.full(total_blocks, BLOCK_UNKNOWN, dtype=np.uint8)
+        start = 0
+        for block_id, count in (
+            (BLOCK_FRAGMENTED, num_fragmented),
+            (BLOCK_NON_FRAGMENTED, num_non_fragmented),
+            (BLOCK_EMPTY, num_empty),
+            (BLOCK_METADATA, num_metadata),
+            (BLOCK_UNMOVABLE, num_unmovable),
+        ):
+            ids[start:start + count] = block_id
+            start += count
+
+        self._rng.shuffle(ids)
+        self.disk_map_ids = ids.reshape(self.rows, self.cols)
+
+    def _rebuild_pixmap(self):
+        # Haritayı ekran dışı bir pixmap'e bir kez çiz; paintEvent yalnızca bunu kopyalar
+        if self.disk_map_ids is None:
+            self._cached_pixmap = None
+            self._rgba = None
+            return
+
+        width = self.cols * self.block_size
+        height = self.rows * self.block_size
+
+        # Her blok bir piksel: renkler tek seferde arama tablosundan gelir.
+        # QImage tamponu kopyalamadığı için dizi self üzerinde tutulur.
+        self._rgba = np.ascontiguousarray(self.PALETTE[self.disk_map_ids])
+        image = QImage(self._rgba.data, self.cols, self.rows, 4 * self.cols, QImage.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image).scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation)
+
+        painter = QPainter(pixmap)
+
+        # Izgara: tek bloklık karo tüm haritaya döşenir
+        painter.drawTiledPixmap(0, 0, width, height, self._grid_tile)
+        # Karo yalnızca üst ve sol kenarı çizdiği için dış çerçeveyi kapat
+        painter.setPen(Qt.gray)
+        painter.drawRect(0, 0, width - 1, height - 1)
+        painter.end()
+        self._cached_pixmap = pixmap
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
 
         offset_x = self.lineWidth()
         offset_y = self.lineWidth()
 
-        if not self.disk_map_data:
+        if self._cached_pixmap is None:
             painter.drawText(self.rect(), Qt.AlignCenter, "Disk Haritası Verisi Yok / Yükleniyor...")
             return
 
-        for r in range(self.rows):
-            for c in range(self.cols):
-                color = self.disk_map_data[r][c]
-                painter.setBrush(QColor(color))
-                painter.setPen(QPen(Qt.gray, 0.5))
-
-                x = offset_x + c * self.block_size
-                y = offset_y + r * self.block_size
-                painter.drawRect(x, y, self.block_size, self.block_size)
-
+        # Sadece Qt'nin yeniden çizilmesini istediği bölgeyi kopyala
+        map_rect = self._cached_pixmap.rect().translated(offset_x, offset_y)
+        dirty = event.rect().intersected(map_rect)
+        if not dirty.isEmpty():
+            painter.drawPixmap(dirty, self._cached_pixmap, dirty.translated(-offset_x, -offset_y))
         painter.end()
 
     def resizeEvent(self, event):
+        self._resize_timer.start()
+
+    def _do_regenerate(self):
         self.generate_dummy_map_data()
+        self._rebuild_pixmap()
         self.update()
 
 
@@ -159,34 +227,56 @@ class DefragWorker(QThread):
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
+    map_update = pyqtSignal(int) # Harita widget'ı GUI thread'inde güncellensin diye
+
+    # e4defrag her dosya için "[N/M]" biçiminde ilerleme yazar. Dosya adları
+    # UTF-8 olmayabileceği için çıktı bayt olarak okunur.
+    _PROGRESS_RE = re.compile(rb'\[(\d+)/(\d+)\]')
 
-    def __init__(self, device_path, map_widget):
+    def __init__(self, device_path):
         super().__init__()
         self.device_path = device_path
-        self.map_widget = map_widget
         self.is_running = True
+        self._last_progress = -1
+
+    def _emit_progress(self, value):
+        # Aynı yüzde için tekrar sinyal gönderme
+        if value != self._last_progress:
+            self._last_progress = value
+            self.progress.emit(value)
 
     def run(self):
+        process = None
         try:
             # Simülasyon: Birleştirme başlamadan önce haritayı güncelle (yüksek parçalanma göster)
-            self.progress.emit(10)
-            self.map_widget.set_fragmentation_score(90)
-            self.msleep(500)
+            self._emit_progress(10)
+            self.map_update.emit(90)
 
             # Gerçek e4defrag komutu
             command = ["pkexec", "/usr/sbin/e4defrag", self.device_path]
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            
-            # Gerçek çıktı olmadığı için ilerlemeyi simüle edelim
-            for i in range(10):
-                if not self.is_running: return
-                self.progress.emit(10 + i * 8)
-                self.msleep(500)
-
-            stdout, stderr = process.communicate()
+            # stderr bir geçici dosyaya yazılır: stdout okunurken dolan bir stderr borusu
+            # süreci kilitlemesin
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+
+                # İlerlemeyi e4defrag'ın kendi "[N/M]" satırlarından hesapla (%10 - %90 arası)
+                lines = []
+                for line in process.stdout:
+                    if not self.is_running: return
+                    lines.append(line)
+                    matches = self._PROGRESS_RE.findall(line)
+                    if matches:
+                        done, total = map(int, matches[-1])
+                        if total > 0:
+                            self._emit_progress(10 + (80 * done) // total)
+
+                process.wait()
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors="replace")
+            stdout = b"".join(lines).decode(errors="replace")
 
             if process.returncode == 0:
-                self.progress.emit(100)
+                self._emit_progress(100)
                 self.finished.emit(f"Disk birleştirme işlemi başarıyla tamamlandı: {self.device_path}\n\n{stdout}")
             else:
                 self.error.emit(f"Disk birleştirme işlemi sırasında bir hata oluştu:\n\n{stderr}")
@@ -194,10 +284,13 @@ class DefragWorker(QThread):
         except Exception as e:
             self.error.emit(f"Beklenmedik bir hata oluştu: {e}")
         finally:
-            if self.isFinished() or (hasattr(process, 'returncode') and process.returncode == 0):
-                self.map_widget.set_fragmentation_score(0) # Başarılıysa skoru 0 yap
-            else:
-                self.map_widget.set_fragmentation_score(self.map_widget.fragmentation_score) # Hata veya yarım kalırsa son skoru koru
+            if process is not None and process.returncode is None:
+                # Okuma yarıda kaldıysa e4defrag okuyucusuz ve sahipsiz kalmasın
+                process.kill()
+                process.wait()
+            if process is not None and process.returncode == 0:
+                self.map_update.emit(0) # Başarılıysa skoru 0 yap
+            # Hata veya yarım kalırsa haritadaki son skor korunur
             self.is_running = False
 
 
@@ -211,6 +304,10 @@ class CheckDefragWorker(QThread):
     finished = pyqtSignal(int, str)
     error = pyqtSignal(str)
 
+    # Çıktı bayt olarak okunur; yalnızca gereken kısımlar çözülür
+    _SCORE_RE = re.compile(rb'Fragmentation score\s*(\d+)')
+    _NOFRAG = b'No fragmentation found'
+
     def __init__(self, device_path):
         super().__init__()
         self.device_path = device_path
@@ -218,25 +315,20 @@ class CheckDefragWorker(QThread):
     def run(self):
         try:
             command = ["pkexec", "/usr/sbin/e4defrag", "-c", self.device_path]
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = process.communicate()
 
             if process.returncode == 0:
                 score = -1
-                lines = stdout.splitlines()
-
-                found_score_line = False
-                for line in lines:
-                    if "Fragmentation score" in line:
-                        match = re.search(r'Fragmentation score\s*(\d+)', line)
-                        if match:
-                            score = int(match.group(1))
-                            found_score_line = True
-                    if "No fragmentation found" in line and not found_score_line:
-                        score = 0
-
-                self.finished.emit(score, stdout)
+                match = self._SCORE_RE.search(stdout)
+                if match:
+                    score = int(match.group(1))
+                elif self._NOFRAG in stdout:
+                    score = 0
+
+                self.finished.emit(score, stdout.decode(errors="replace"))
             else:
+                stderr = stderr.decode(errors="replace")
                 self.error.emit(f"Disk parçalanma kontrolü sırasında bir hata oluştu:\n{stderr}")
 
         except FileNotFoundError:
@@ -249,18 +341,19 @@ class DiskDefragmenterApp(QWidget):
         super().__init__()
         self.worker = None
         self.check_worker = None
-        self.media_player = QMediaPlayer() # Medya oynatıcı objesi
-        self.playlist = QMediaPlaylist() # Playlist objesi
-        self.movie = None # QMovie objesi
+        self._last_shown_path = None # Disk haritasının en son sıfırlandığı diskin yolu
+        self.media_player = None # Medya oynatıcı objesi (ilk çalmada oluşturulur)
+        self.playlist = None # Playlist objesi (ilk çalmada oluşturulur)
+        self.movie = QMovie(_GIF) # QMovie objesi, 2.gif bir kez yüklenir
+        self.movie.setCacheMode(QMovie.CacheAll)
+        self._initial_pixmap = QPixmap(_IMG_INITIAL) # 1.png bir kez çözülür
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle('Linux Disk Fragmenter')
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        icon_path = os.path.join(current_dir, 'fragmenter.png')
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+
+        if _ICON_EXISTS:
+            self.setWindowIcon(QIcon(_ICON))
 
         self.setGeometry(300, 300, 800, 600)
 
@@ -297,6 +390,11 @@ class DiskDefragmenterApp(QWidget):
         self.defrag_result_label.setWordWrap(True)
         self.defrag_result_label.setStyleSheet("font-weight: bold; color: green;")
 
+        # Birleştirme ilerlemesi (yalnızca birleştirme sırasında görünür)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+
         self.image_display_label = QLabel()
         self.image_display_label.setAlignment(Qt.AlignCenter)
         self.image_display_label.setScaledContents(True)
@@ -309,6 +407,7 @@ class DiskDefragmenterApp(QWidget):
         info_vertical_layout.addSpacing(15) # Butonlar ile bilgi arasında boşluk
         info_vertical_layout.addWidget(self.info_label)
         info_vertical_layout.addWidget(self.defrag_result_label)
+        info_vertical_layout.addWidget(self.progress_bar)
         # info_vertical_layout.addStretch(1) # Bu satır boşluğu minimize etmek için kaldırıldı.
 
         # Bilgi etiketleri ve resim için ana yatay düzen
@@ -329,13 +428,14 @@ class DiskDefragmenterApp(QWidget):
         main_layout.addLayout(disk_map_group_box) # Ana düzene ekle
 
         # Renk Anahtarı (Legend)
+        self._legend_swatches = {key: _swatch(color) for key, color in COLOR_SCHEME.items()}
         legend_layout = QHBoxLayout()
-        self.add_legend_item(legend_layout, "Boş Yerler", "Diskteki kullanılabilir boş alan", COLOR_SCHEME["empty"])
-        self.add_legend_item(legend_layout, "Meta Veriler", "Dosya sistemi yapıları ve indeksler", COLOR_SCHEME["metadata"])
-        self.add_legend_item(legend_layout, "Parçalanmamış", "Düzgün yerleşmiş dosya parçaları", COLOR_SCHEME["non_fragmented"])
-        self.add_legend_item(legend_layout, "Parçalanmış", "Dağınık dosya parçaları, birleştirilmeli", COLOR_SCHEME["fragmented"])
-        self.add_legend_item(legend_layout, "Taşınamaz", "Sistem veya kullanıcı tarafından kilitlenmiş alanlar", COLOR_SCHEME["unmovable"])
-        self.add_legend_item(legend_layout, "Bilinmeyen/Boş", "Durumu bilinmeyen veya başlangıç bloğu", COLOR_SCHEME["unknown"])
+        self.add_legend_item(legend_layout, "Boş Yerler", "Diskteki kullanılabilir boş alan", "empty")
+        self.add_legend_item(legend_layout, "Meta Veriler", "Dosya sistemi yapıları ve indeksler", "metadata")
+        self.add_legend_item(legend_layout, "Parçalanmamış", "Düzgün yerleşmiş dosya parçaları", "non_fragmented")
+        self.add_legend_item(legend_layout, "Parçalanmış", "Dağınık dosya parçaları, birleştirilmeli", "fragmented")
+        self.add_legend_item(legend_layout, "Taşınamaz", "Sistem veya kullanıcı tarafından kilitlenmiş alanlar", "unmovable")
+        self.add_legend_item(legend_layout, "Bilinmeyen/Boş", "Durumu bilinmeyen veya başlangıç bloğu", "unknown")
         main_layout.addLayout(legend_layout) # Ana düzene ekle
 
         self.populate_disks()
@@ -345,34 +445,25 @@ class DiskDefragmenterApp(QWidget):
         self.setLayout(main_layout)
 
     def load_initial_image(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        image_path = os.path.join(current_dir, '1.png')
-
         # Clear any existing movie or pixmap to ensure a clean slate
-        if self.movie and self.movie.state() == QMovie.Running:
+        if self.movie.state() == QMovie.Running:
             self.movie.stop()
         self.image_display_label.setMovie(None) # Detach movie from label if any
         self.image_display_label.clear() # Clear any pixmap content from label
 
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            self.image_display_label.setPixmap(pixmap)
+        if not self._initial_pixmap.isNull():
+            self.image_display_label.setPixmap(self._initial_pixmap)
         else:
             self.image_display_label.setText("Image not found: 1.png")
 
     def start_operation_animation(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        gif_path = os.path.join(current_dir, '2.gif')
-
         # Stop and clear any existing movie/pixmap
-        if self.movie and self.movie.state() == QMovie.Running:
+        if self.movie.state() == QMovie.Running:
             self.movie.stop()
         self.image_display_label.setMovie(None) # Detach movie from label if any
         self.image_display_label.clear() # Clear any pixmap content from label
 
-        self.movie = QMovie(gif_path)
         if self.movie.isValid():
-            self.movie.setCacheMode(QMovie.CacheAll)
             self.image_display_label.setMovie(self.movie)
             self.movie.start()
         else:
@@ -380,15 +471,14 @@ class DiskDefragmenterApp(QWidget):
             self.load_initial_image()
 
     def stop_operation_animation(self):
-        if self.movie and self.movie.state() == QMovie.Running:
+        if self.movie.state() == QMovie.Running:
             self.movie.stop()
-        self.image_display_label.clear()
         self.load_initial_image()
 
-    def add_legend_item(self, layout, text, tooltip, color):
+    def add_legend_item(self, layout, text, tooltip, color_key):
         color_label = QLabel()
         color_label.setFixedSize(20, 15)
-        color_label.setStyleSheet(f"background-color: {color.name()}; border: 1px solid gray;")
+        color_label.setPixmap(self._legend_swatches[color_key])
         
         text_label = QLabel(text)
         text_label.setToolTip(tooltip)
@@ -411,27 +501,29 @@ class DiskDefragmenterApp(QWidget):
         QMessageBox.information(self, "Hakkında", about_text)
 
     def play_background_music(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        music_path = os.path.join(current_dir, 'Open Those Bright Eyes.mp3')
-        
-        if os.path.exists(music_path):
-            self.playlist.clear()
-            self.playlist.addMedia(QMediaContent(QUrl.fromLocalFile(music_path)))
-            self.playlist.setPlaybackMode(QMediaPlaylist.Loop) # Müziğin sürekli tekrar etmesini sağlar
-            self.media_player.setPlaylist(self.playlist)
-            self.media_player.setVolume(50)
+        if _MUSIC_EXISTS:
+            if self.media_player is None:
+                # Multimedya altyapısı pencere açılışını yavaşlatmasın diye ilk kullanımda kurulur.
+                # Müzik dosyası bir kez eklenir; sonraki işlemlerde sadece play() çağrılır.
+                self.media_player = QMediaPlayer()
+                self.playlist = QMediaPlaylist()
+                self.playlist.addMedia(QMediaContent(QUrl.fromLocalFile(_MUSIC)))
+                self.playlist.setPlaybackMode(QMediaPlaylist.Loop) # Müziğin sürekli tekrar etmesini sağlar
+                self.media_player.setPlaylist(self.playlist)
+                self.media_player.setVolume(50)
             self.media_player.play()
         else:
             pass
 
     def stop_background_music(self):
-        if self.media_player.state() == QMediaPlayer.PlayingState:
+        if self.media_player is not None and self.media_player.state() == QMediaPlayer.PlayingState:
             self.media_player.stop()
 
     def populate_disks(self):
         try:
-            command = ["lsblk", "-o", "NAME,FSTYPE,MOUNTPOINT,PATH", "--json"]
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            # loop (7), ram (1) ve optik sürücüler (11) listelenmez
+            command = ["lsblk", "-o", "NAME,FSTYPE,MOUNTPOINT,PATH", "-J", "-p", "-e", "7,1,11"]
+            result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=10)
             disk_info = json.loads(result.stdout)
 
             self.disks = []
@@ -482,11 +574,17 @@ class DiskDefragmenterApp(QWidget):
 
     def on_disk_selection_changed(self):
         selected_index = self.disk_combobox.currentIndex()
+        valid_selection = selected_index != -1 and self.disks and selected_index < len(self.disks)
+        selected_path = self.disks[selected_index]["path"] if valid_selection else None
+
         self.defrag_result_label.clear()
-        self.disk_map_widget.set_fragmentation_score(-1)
+        # Aynı disk için haritayı tekrar oluşturup çizme
+        if selected_path != self._last_shown_path:
+            self.disk_map_widget.set_fragmentation_score(-1)
+        self._last_shown_path = selected_path
         self.stop_operation_animation()
 
-        if selected_index == -1 or not self.disks or selected_index >= len(self.disks):
+        if not valid_selection:
             self.info_label.setText("Lütfen geçerli bir disk seçin.")
             self.analyze_button.setEnabled(False)
             self.defrag_button.setEnabled(False)
@@ -635,7 +733,12 @@ class DiskDefragmenterApp(QWidget):
             
             self.play_background_music()
 
-            self.worker = DefragWorker(device_path, self.disk_map_widget)
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
+
+            self.worker = DefragWorker(device_path)
+            self.worker.progress.connect(self.progress_bar.setValue)
+            self.worker.map_update.connect(self.disk_map_widget.set_fragmentation_score)
             self.worker.finished.connect(self.defrag_finished)
             self.worker.error.connect(self.defrag_error)
             
@@ -682,8 +785,10 @@ class DiskDefragmenterApp(QWidget):
         self.defrag_button.setEnabled(False)
         self.analyze_button.setEnabled(True)
         self.disk_combobox.setEnabled(True)
+        self.progress_bar.setVisible(False)
         self.worker = None
         self.check_worker = None
+        self._last_shown_path = None # İşlem sonrası harita her durumda sıfırlansın
         self.on_disk_selection_changed()
 
 